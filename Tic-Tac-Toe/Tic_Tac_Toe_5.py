@@ -23,6 +23,7 @@ This program implements a 5x5 Tic-Tac-Toe game where you can play against an AI,
 - Python 3.6 or higher
 - Tkinter library (usually included with standard Python installations)
 - Numpy library (install using `pip install numpy`)
+- Numba library (optional, install using `pip install numba`) to compile the training loop
 
 **Developed by:**
 Art Casasa 
@@ -31,82 +32,332 @@ Art Casasa
 import numpy as np
 import random
 import tkinter as tk
-from tkinter import messagebox
+
+try:
+    from numba import njit, types
+    from numba.typed import Dict
+except ImportError:  # Numba is optional, training falls back to plain Python
+    njit = None
 
 # Constants for the game
 BOARD_SIZE = 5  # The game board is 5x5, as specified in the term project
+CELLS = BOARD_SIZE * BOARD_SIZE  # 25 cells, and therefore 25 possible actions
 EXPLORATION_RATE = 1.0  # Initial exploration rate for the AI's Q-learning
 EXPLORATION_DECAY = 0.995  # Decay rate for exploration to gradually favor exploitation
-LEARNING_RATE = 0.1  # Learning rate for updating Q-values
-DISCOUNT_FACTOR = 0.9  # Discount factor for future rewards
+LEARNING_RATE = np.float32(0.1)  # Learning rate for updating Q-values
+DISCOUNT_FACTOR = np.float32(0.9)  # Discount factor for future rewards
 EPISODES = 1000  # Reduced number of training episodes for quicker training
+EPISODE_BATCH = 64  # Number of training episodes played per call into the training loop
+Q_CAPACITY = EPISODES * CELLS + 1  # Room for every state EPISODES games can reach
+PRIOR_SCALE = 0.01  # Weight of the win-line heuristic that new Q-values start from
+AI_MOVE_DELAY_MS = 10  # Pause before each scheduled AI move in the GUI
+RESET_DELAY_MS = 200  # Time the result stays on the board before the next game starts
+
+# Bitboard layout: the whole board is a single int. O's pieces occupy the low 25 bits and
+# X's pieces the next 25 bits, with cell (row, col) mapped to bit row * BOARD_SIZE + col.
+EMPTY_BOARD = 0
+FULL_MASK = (1 << CELLS) - 1
+O_SHIFT = 0
+X_SHIFT = CELLS
+PLAYER_SHIFT = {'O': O_SHIFT, 'X': X_SHIFT}
+
+# Winning lines: the cell indices of the 5 rows, 5 columns and 2 diagonals as one (12, 5)
+# table, folded into one bit mask per line so all lines are checked in a single pass
+LINE_IDX = np.array(
+    [[i * BOARD_SIZE + j for j in range(BOARD_SIZE)] for i in range(BOARD_SIZE)]  # Rows
+    + [[j * BOARD_SIZE + i for j in range(BOARD_SIZE)] for i in range(BOARD_SIZE)]  # Columns
+    + [[i * BOARD_SIZE + i for i in range(BOARD_SIZE)],  # Main diagonal
+       [i * BOARD_SIZE + BOARD_SIZE - i - 1 for i in range(BOARD_SIZE)]],  # Anti-diagonal
+    dtype=np.int8,
+)
+LINES = np.bitwise_or.reduce(np.int64(1) << LINE_IDX.astype(np.int64), axis=1)
+
+# Starting Q-values for a newly seen state: cells on more winning lines are better moves, so
+# each action starts at the number of lines through its cell (4 at the centre, 3 on the
+# diagonals, 2 elsewhere), scaled well below the +/-1 rewards
+PRIOR = (np.bincount(LINE_IDX.ravel(), minlength=CELLS) * PRIOR_SCALE).astype(np.float32)
 
-# Q-Table for storing state-action values
-Q = {}
+# Board symmetries: the 4 rotations of the board and their mirror images. SYMMETRIES[k, c]
+# is the cell that cell c moves to under symmetry k, and INVERSE_SYMMETRIES[k] undoes it.
+SYMMETRIES = np.zeros((8, CELLS), dtype=np.int64)
+INVERSE_SYMMETRIES = np.zeros((8, CELLS), dtype=np.int64)
+for k in range(8):
+    grid = np.rot90(np.arange(CELLS).reshape(BOARD_SIZE, BOARD_SIZE), k % 4)
+    if k >= 4:
+        grid = np.fliplr(grid)
+    INVERSE_SYMMETRIES[k] = grid.ravel()
+    SYMMETRIES[k, grid.ravel()] = np.arange(CELLS)
+
+# Compile a function with Numba when it is available
+def jit(func):
+    """
+    Compiles the given function to machine code with Numba's nopython mode. Without Numba the
+    function is returned unchanged and runs as ordinary Python, so everything decorated here
+    only uses the subset of Python and NumPy that Numba supports.
+    """
+    if njit is None:
+        return func
+    return njit(cache=True)(func)
+
+# Create an empty index from states to Q-table rows
+def new_state_index():
+    """
+    Creates an empty mapping from board states to their row in the Q-table. With Numba this
+    is a typed dictionary so that the compiled training loop can read and grow it directly.
+    """
+    if njit is None:
+        return {}
+    return Dict.empty(key_type=types.int64, value_type=types.int64)
+
+# Q-Table for storing state-action values: one contiguous float32 row of 25 action values per
+# known state, with state_index giving each state's row. Rows are handed out in visiting order
+# and the array doubles in size whenever it fills up. Unused rows are filled with PRIOR ahead
+# of time, so a state starts from the heuristic as soon as it is given a row.
+Q_rows = np.tile(PRIOR, (Q_CAPACITY, 1))
+state_index = new_state_index()
 
 # Initialize the Q-table with all possible states
-def initialize_q_table(board):
+@jit
+def initialize_q_table(Q_rows, state_index, state):
     """
     Initializes the Q-table with a given board state if not already present.
     Each state-action pair is represented by a unique board configuration (state)
-    and the potential actions (moves) from that state.
+    and the potential actions (moves) from that state. Returns the Q-table, which is a new,
+    larger array if it had to grow, and the row holding the state's Q-values.
     """
-    state = board_to_tuple(board)
-    if state not in Q:
-        Q[state] = np.zeros(BOARD_SIZE * BOARD_SIZE)  # 25 possible actions on a 5x5 board
+    # New states get the next free row, so a single lookup both finds and inserts the state
+    row = state_index.setdefault(state, len(state_index))
+    if row == Q_rows.shape[0]:
+        grown = np.empty((2 * row, CELLS), dtype=np.float32)
+        grown[:row] = Q_rows
+        grown[row:] = PRIOR
+        Q_rows = grown
+    return Q_rows, row
 
-# Convert board to a hashable tuple for the Q-table
-def board_to_tuple(board):
+# Apply one of the board symmetries to a state
+@jit
+def transform(state, k):
     """
-    Converts the 2D list representing the board into a tuple of tuples.
-    This transformation is necessary to use the board as a key in the Q-table dictionary.
+    Returns the board state obtained by moving every piece of both players according to
+    symmetry k.
     """
-    return tuple(tuple(row) for row in board)
+    result = EMPTY_BOARD
+    for c in range(CELLS):
+        if (state >> c) & 1:
+            result |= 1 << SYMMETRIES[k, c]
+        if (state >> (c + CELLS)) & 1:
+            result |= 1 << (SYMMETRIES[k, c] + CELLS)
+    return result
+
+# Reduce a state to a single representative of its symmetric variants
+@jit
+def canonical(state):
+    """
+    Returns the smallest of the 8 rotated and mirrored versions of the state, which is used as
+    the Q-table key so that symmetric positions share their Q-values, together with the index
+    of the symmetry producing it. Actions chosen for the key are mapped back onto the real
+    board with INVERSE_SYMMETRIES.
+    """
+    best_key = state
+    best_k = 0
+    for k in range(1, 8):
+        key = transform(state, k)
+        if key < best_key:
+            best_key = key
+            best_k = k
+    return best_key, best_k
+
+# Place a piece on every symmetric image of the board at once
+@jit
+def place_symmetric(images, action, shift):
+    """
+    Updates, in place, the 8 transformed versions of the board (images[k] is the board under
+    symmetry k, and images[0] the real board) for a piece placed at cell action. Keeping the
+    images up to date move by move makes the canonical key an 8-way min per move instead of
+    re-transforming all 25 cells for each symmetry.
+    """
+    for k in range(8):
+        images[k] |= 1 << (SYMMETRIES[k, action] + shift)
+
+# Get the cells taken by either player
+@jit
+def occupancy(state):
+    """
+    Folds both players' bits together, returning a 25-bit mask with a bit set for every
+    occupied cell.
+    """
+    return (state | (state >> CELLS)) & FULL_MASK
+
+# Place a player's piece on the board
+@jit
+def place_piece(state, action, shift):
+    """
+    Returns the board state after the player whose bits start at shift (see PLAYER_SHIFT)
+    takes the cell numbered by action.
+    """
+    return state | (1 << (action + shift))
 
 # Check if a player has won the game
-def is_winner(board, player):
+@jit
+def is_winner(state, shift):
+    """
+    Checks if the player whose bits start at shift has won the game by getting 5 of their
+    symbols in a row, column, or diagonal.
+    """
+    bits = state >> shift
+    return np.any(LINES & bits == LINES)
+
+# Count the set bits of a cell mask
+@jit
+def popcount(x):
+    """
+    Returns the number of set bits in x by clearing the lowest set bit until none are left.
+    LLVM recognizes this loop and compiles it to a single hardware popcount instruction.
+    """
+    n = 0
+    while x:
+        x &= x - 1
+        n += 1
+    return n
+
+# Find the best legal action in a row of Q-values
+@jit
+def best_action(q_row, occupied):
     """
-    Checks if the given player has won the game by getting 5 of their symbols in a row,
-    column, or diagonal.
+    Scans the Q-values for the highest one among the empty cells, visiting only the cells
+    whose bit is clear in the occupied mask. Returns -1 when the board is full.
     """
-    # Check rows and columns
-    for i in range(BOARD_SIZE):
-        if all(board[i][j] == player for j in range(BOARD_SIZE)) or all(board[j][i] == player for j in range(BOARD_SIZE)):
-            return True
-    # Check diagonals
-    if all(board[i][i] == player for i in range(BOARD_SIZE)) or all(board[i][BOARD_SIZE-i-1] == player for i in range(BOARD_SIZE)):
-        return True
-    return False
+    best_a = -1
+    best = -np.inf
+    empties = ~occupied & FULL_MASK
+    while empties:
+        lowest = empties & -empties
+        a = popcount(lowest - 1)  # Index of the lowest empty cell
+        if q_row[a] > best:
+            best = q_row[a]
+            best_a = a
+        empties ^= lowest
+    return best_a
 
-# Check if the game has ended in a draw
-def is_draw(board):
+# Pick an empty cell uniformly at random
+@jit
+def random_empty_cell(occupied):
     """
-    Returns True if the board is full and no player has won, indicating a draw.
+    Counts the empty cells in the occupied mask, draws k uniformly among them, and returns
+    the index of the k-th empty cell by clearing the k lowest empty bits. Returns -1 when the
+    board is full.
     """
-    return all(all(cell != ' ' for cell in row) for row in board)
+    empties = ~occupied & FULL_MASK
+    n_empty = popcount(empties)
+    if n_empty == 0:
+        return -1
+    k = int(random.random() * n_empty)
+    for _ in range(k):
+        empties &= empties - 1
+    return popcount((empties & -empties) - 1)
 
 # Choose an action using the epsilon-greedy strategy
-def choose_action(state, exploration_rate):
+@jit
+def choose_action(q_row, occupied, exploration_rate):
     """
     Selects an action using an epsilon-greedy strategy, balancing exploration and exploitation.
     If a randomly generated number is less than the exploration rate, a random move is chosen
     (exploration); otherwise, the best known move from the Q-table is selected (exploitation).
+    Occupied cells are never chosen, so every action is a legal move.
     """
-    if random.uniform(0, 1) < exploration_rate:
-        return random.randint(0, BOARD_SIZE * BOARD_SIZE - 1)  # Explore: random action
+    if random.random() < exploration_rate:
+        return random_empty_cell(occupied)  # Explore: random legal action
     else:
-        return np.argmax(Q[state])  # Exploit: best action based on Q-values
+        return best_action(q_row, occupied)  # Exploit: best legal action based on Q-values
 
 # Update the Q-values based on the reward received
-def update_q_table(state, action, reward, next_state):
+@jit
+def update_q_table(Q_rows, row, action, reward, next_row, next_state, done):
     """
     Updates the Q-table using the Q-learning formula. The Q-value for the state-action pair is updated
     based on the observed reward and the maximum future reward possible from the next state.
+    Both states are given by their rows in Q_rows. A finished game has no future reward, so
+    the target is then the reward alone. All arithmetic stays in float32, like the Q-table.
+    """
+    td_target = np.float32(reward)
+    if not done:
+        best_next_action = best_action(Q_rows[next_row], occupancy(next_state))
+        td_target += DISCOUNT_FACTOR * Q_rows[next_row, best_next_action]
+    td_error = td_target - Q_rows[row, action]
+    Q_rows[row, action] += LEARNING_RATE * td_error
+
+# Play a single training game of the AI against itself
+@jit
+def run_episode(Q_rows, state_index, exploration_rate):
+    """
+    Plays one game from an empty board with the AI moving for both players, recording every
+    move and replaying them into the Q-values once the game is over. O always moves first and
+    rewards are given from O's side. Returns the Q-table, which is a new array if it grew
+    during the game.
     """
-    best_next_action = np.argmax(Q[next_state])
-    td_target = reward + DISCOUNT_FACTOR * Q[next_state][best_next_action]
-    td_error = td_target - Q[state][action]
-    Q[state][action] += LEARNING_RATE * td_error
+    images = np.zeros(8, dtype=np.int64)  # The empty board under each of the 8 symmetries
+    key, k = EMPTY_BOARD, 0
+    Q_rows, row = initialize_q_table(Q_rows, state_index, key)
+    done = False
+    current_shift = O_SHIFT  # AI starts first in the training
+    moves = 0  # The board is full, and the game a draw, once all 25 cells are taken
+
+    # Buffer of the game's transitions; a game never lasts more than 25 moves
+    rows = np.empty(CELLS, dtype=np.int64)
+    actions = np.empty(CELLS, dtype=np.int64)
+    rewards = np.empty(CELLS, dtype=np.float32)
+    next_rows = np.empty(CELLS, dtype=np.int64)
+    next_keys = np.empty(CELLS, dtype=np.int64)
+
+    while not done:
+        # Actions are chosen and learned for the canonical key, then mapped onto the real board
+        action = choose_action(Q_rows[row], occupancy(key), exploration_rate)
+        place_symmetric(images, INVERSE_SYMMETRIES[k, action], current_shift)
+        next_state = images[0]
+        moves += 1
+        reward = 0.0
+
+        # Check for win/loss/draw conditions
+        if is_winner(next_state, current_shift):
+            reward = 1.0 if current_shift == O_SHIFT else -1.0
+            done = True
+        elif moves == CELLS:
+            reward = 0.0
+            done = True
+
+        # Record the transition
+        next_k = np.argmin(images)
+        next_key = images[next_k]
+        Q_rows, next_row = initialize_q_table(Q_rows, state_index, next_key)
+        t = moves - 1
+        rows[t], actions[t], rewards[t] = row, action, reward
+        next_rows[t], next_keys[t] = next_row, next_key
+
+        key, k, row = next_key, next_k, next_row
+        current_shift = X_SHIFT if current_shift == O_SHIFT else O_SHIFT
+
+    # Update Q-table, replaying the game backwards so that every update already sees the new
+    # values of the position after it and the final reward reaches the opening in one game
+    for t in range(moves - 1, -1, -1):
+        update_q_table(Q_rows, rows[t], actions[t], rewards[t], next_rows[t], next_keys[t],
+                       t == moves - 1)
+    return Q_rows
+
+# Play a batch of training games in one call
+@jit
+def run_episodes(Q_rows, state_index, exploration_rate, episodes):
+    """
+    Plays the given number of training games back to back, decaying the exploration rate
+    after each one. Running a whole batch per call keeps the loop inside compiled code
+    instead of returning to the interpreter after every game. Returns the Q-table, which is
+    a new array if it grew, and the decayed exploration rate.
+    """
+    for episode in range(episodes):
+        Q_rows = run_episode(Q_rows, state_index, exploration_rate)
+
+        # Decay the exploration rate to gradually shift from exploration to exploitation
+        exploration_rate *= EXPLORATION_DECAY
+    return Q_rows, exploration_rate
 
 # Train the AI using Q-learning over multiple episodes
 def train_ai(episodes):
@@ -115,59 +366,33 @@ def train_ai(episodes):
     During training, the AI explores various strategies by playing games against itself,
     updating the Q-values in the Q-table to reflect better actions.
     """
-    global EXPLORATION_RATE
-    for episode in range(episodes):
-        # Reset the game board
-        board = [[' ' for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
-        initialize_q_table(board)
-        state = board_to_tuple(board)
-        done = False
-        current_player = 'O'  # AI starts first in the training
-
-        while not done:
-            action = choose_action(state, EXPLORATION_RATE)
-            row, col = divmod(action, BOARD_SIZE)
-
-            if board[row][col] == ' ':
-                board[row][col] = current_player
-                reward = 0
-
-                # Check for win/loss/draw conditions
-                if is_winner(board, current_player):
-                    reward = 1 if current_player == 'O' else -1
-                    done = True
-                elif is_draw(board):
-                    reward = 0
-                    done = True
-
-                # Update Q-table
-                next_state = board_to_tuple(board)
-                initialize_q_table(board)
-                update_q_table(state, action, reward, next_state)
-
-                state = next_state
-                current_player = 'X' if current_player == 'O' else 'O'
-
-        # Decay the exploration rate to gradually shift from exploration to exploitation
-        EXPLORATION_RATE *= EXPLORATION_DECAY
+    global EXPLORATION_RATE, Q_rows
+    for start in range(0, episodes, EPISODE_BATCH):
+        batch = min(EPISODE_BATCH, episodes - start)
+        Q_rows, EXPLORATION_RATE = run_episodes(Q_rows, state_index, EXPLORATION_RATE, batch)
 
 # Initialize the GUI and game logic
 class TicTacToeGame:
-    def __init__(self, root, player_symbol, ai_symbol, human_starts):
+    def __init__(self, root, player_symbol, ai_symbol, human_starts, ai_vs_ai=False):
         """
         Initializes the Tic-Tac-Toe game GUI. Sets up the board, symbols for the player and AI,
-        and determines who starts first.
+        and determines who starts first. With ai_vs_ai the AI plays both symbols and keeps
+        playing game after game on its own.
         """
         self.root = root
         self.root.title("5x5 Tic-Tac-Toe with Q-learning AI")
-        self.board = [[' ' for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+        self.state = EMPTY_BOARD
+        self.moves = 0
         self.human_symbol = player_symbol
         self.ai_symbol = ai_symbol
-        self.current_player = player_symbol if human_starts else ai_symbol
+        self.ai_vs_ai = ai_vs_ai
+        self.current_player = player_symbol if human_starts and not ai_vs_ai else ai_symbol
         self.buttons = [[None for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
         self.create_buttons()
-        if not human_starts:
-            self.ai_move()
+        self.status = tk.Label(self.root, text=' ', font='Arial 14')
+        self.status.grid(row=BOARD_SIZE, column=0, columnspan=BOARD_SIZE)
+        if self.current_player == self.ai_symbol:
+            self.root.after(AI_MOVE_DELAY_MS, self.ai_move)
 
     # Create buttons for each cell in the board
     def create_buttons(self):
@@ -187,12 +412,15 @@ class TicTacToeGame:
         Handles the logic for a player's move. Updates the board and the corresponding button
         if the move is valid. Checks for a win or draw condition after the move.
         """
-        if self.board[row][col] == ' ' and self.current_player == self.human_symbol:
-            self.board[row][col] = self.human_symbol
+        action = row * BOARD_SIZE + col
+        if (not self.ai_vs_ai and not occupancy(self.state) >> action & 1
+                and self.current_player == self.human_symbol):
+            self.state = place_piece(self.state, action, PLAYER_SHIFT[self.human_symbol])
+            self.moves += 1
             self.buttons[row][col].config(text=self.human_symbol)
-            if is_winner(self.board, self.human_symbol):
+            if is_winner(self.state, PLAYER_SHIFT[self.human_symbol]):
                 self.end_game(f"Player {self.human_symbol} wins!")
-            elif is_draw(self.board):
+            elif self.moves == CELLS:
                 self.end_game("It's a draw!")
             else:
                 self.current_player = self.ai_symbol
@@ -203,43 +431,55 @@ class TicTacToeGame:
         """
         Executes the AI's move using the best action determined by the Q-table. Updates the
         board and the corresponding button. Checks for a win or draw condition after the move.
+        Only empty cells are considered, and positions never seen in training fall back to the
+        heuristic starting values, so the AI always makes a move. The AI plays the symbol of the
+        current player, which in AI vs. AI mode alternates between both symbols.
         """
-        state = board_to_tuple(self.board)
-        action = np.argmax(Q[state])
+        symbol = self.current_player
+        key, k = canonical(self.state)
+        q_row = Q_rows[state_index[key]] if key in state_index else PRIOR
+        action = int(INVERSE_SYMMETRIES[k, best_action(q_row, occupancy(key))])
         row, col = divmod(action, BOARD_SIZE)
 
-        if self.board[row][col] == ' ':
-            self.board[row][col] = self.ai_symbol
-            self.buttons[row][col].config(text=self.ai_symbol)
-            if is_winner(self.board, self.ai_symbol):
-                self.end_game(f"AI ({self.ai_symbol}) wins!")
-            elif is_draw(self.board):
-                self.end_game("It's a draw!")
-            else:
-                self.current_player = self.human_symbol
+        self.state = place_piece(self.state, action, PLAYER_SHIFT[symbol])
+        self.moves += 1
+        self.buttons[row][col].config(text=symbol)
+        if is_winner(self.state, PLAYER_SHIFT[symbol]):
+            self.end_game(f"AI ({symbol}) wins!")
+        elif self.moves == CELLS:
+            self.end_game("It's a draw!")
+        else:
+            self.current_player = self.human_symbol if symbol == self.ai_symbol else self.ai_symbol
+            if self.ai_vs_ai:
+                self.root.after(AI_MOVE_DELAY_MS, self.ai_move)
 
     # End the game and show a message
     def end_game(self, message):
         """
-        Displays the game result in a message box and resets the game for a new round.
-        This function is called when the game ends in a win or a draw.
+        Displays the game result in the status line and schedules a reset for a new round.
+        This function is called when the game ends in a win or a draw. Nobody can move until
+        the reset, and the Tk event loop keeps running in the meantime instead of blocking on
+        a dialog.
         """
-        messagebox.showinfo("Game Over", message)
-        self.reset_game()
+        self.status.config(text=message)
+        self.current_player = None
+        self.root.after(RESET_DELAY_MS, self.reset_game)
 
     # Reset the game to the initial state
     def reset_game(self):
         """
         Resets the game board and GUI elements to their initial state, allowing for a new game
-        to begin. The current player is set based on the previous game's outcome.
+        to begin. The human moves first in the new game, or the AI in AI vs. AI mode.
         """
-        self.board = [[' ' for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+        self.state = EMPTY_BOARD
+        self.moves = 0
         for i in range(BOARD_SIZE):
             for j in range(BOARD_SIZE):
                 self.buttons[i][j].config(text=' ')
-        self.current_player = self.human_symbol
+        self.status.config(text=' ')
+        self.current_player = self.ai_symbol if self.ai_vs_ai else self.human_symbol
         if self.current_player == self.ai_symbol:
-            self.ai_move()
+            self.root.after(AI_MOVE_DELAY_MS, self.ai_move)
 
 # Main function to start the game
 if __name__ == "__main__":
@@ -265,7 +505,7 @@ if __name__ == "__main__":
         root = tk.Tk()
         human_symbol = 'X'
         ai_symbol = 'O'
-        game = TicTacToeGame(root, human_symbol, ai_symbol, False)  # Start with AI
+        game = TicTacToeGame(root, human_symbol, ai_symbol, False, ai_vs_ai=True)  # Start with AI
         root.mainloop()
     else:
         print("Invalid choice. Please restart the program and choose 1 or 2.")